@@ -12,6 +12,7 @@ files_dir = os.path.join(BASE_DIR, "files")
 json_dir = os.path.join(BASE_DIR, "telegram_data")
 xlsx_dir = os.path.join(BASE_DIR, "analyzed_tables")
 log_file = os.path.join(files_dir, "script.log")
+profiles_file = os.path.join(files_dir, "profiles.txt")
 
 # Ensure directories exist
 os.makedirs(files_dir, exist_ok=True)
@@ -35,14 +36,16 @@ def log(message):
         print(f"Failed to write to log file: {e}")
 
 def delete_old_files(directory):
-    """Delete files older than 3 days."""
+    """Delete files older than 3 days, including per-profile subdirectories."""
     if not os.path.exists(directory):
         log(f"Directory not found: {directory}")
         return
     try:
         for file in os.listdir(directory):
             file_path = os.path.join(directory, file)
-            if os.path.isfile(file_path):
+            if os.path.isdir(file_path):
+                delete_old_files(file_path)
+            elif os.path.isfile(file_path):
                 file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
                 if file_time < cutoff_date:
                     log(f"Deleting {file_path}")
@@ -71,11 +74,12 @@ def run_script(script_name):
         log(f"Script Error Output:\n{e.stderr}")
 
 def json_file_exists():
-    """Check if a JSON file from today exists in the telegram_data directory."""
+    """Check if a JSON file from today exists in the telegram_data directory (or a profile's subdirectory)."""
     try:
-        for file in os.listdir(json_dir):
-            if file.endswith(".json") and today_date in file:
-                return True
+        for _, _, files in os.walk(json_dir):
+            for file in files:
+                if file.endswith(".json") and today_date in file:
+                    return True
     except Exception as e:
         log(f"Error checking JSON files: {e}")
     return False
@@ -87,7 +91,9 @@ def main():
 
     keywords_file = "/opt/python_projects/telegram_shopping/files/keywords.txt"
 
-    if not os.path.exists(keywords_file):
+    if os.path.exists(profiles_file):
+        log(f"SUCCESS: Found profiles.txt")
+    elif not os.path.exists(keywords_file):
         log(f"ERROR: Missing keywords.txt . Stopping execution.")
         return
     else:
@@ -95,7 +101,7 @@ def main():
 
 
     try:
-        # Run main.py only if keywords.txt exists
+        # Run main.py only if keywords.txt (or profiles.txt) exists
         run_script("main.py")
 
         # Check if today's JSON file exists before running the next scripts
@@ -0,0 +1,222 @@
+import io
+import os
+import sys
+import time
+import random
+import asyncio
+import resource
+import tempfile
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import media_ocr
+import profiles
+
+# Benchmark settings
+IMAGE_COUNT = 40
+IMAGE_SIZE = (800, 600)  # Roughly a Telegram "x" thumbnail
+SAMPLE_LINES = [
+    "Bluetooth keyboard - 99 NIS",
+    "SSD 1TB NVMe, free shipping",
+    "Laptop 15.6 inch, 16GB RAM",
+    "https://example.com/deal",
+]
+MESSAGE_COUNT = 2000
+GROUP_COUNT = 3
+GROUP_MESSAGE_COUNT = 200
+IMAGE_EVERY = 5  # Every 5th fetched message carries a photo
+PROFILE_COUNTS = [1, 2, 4, 8, 16, 32]
+KEYWORDS_PER_PROFILE = 20
+VOCABULARY = [f"product{i}" for i in range(300)]
+
+
+# CPU seconds used by this process and its (finished) workers
+def cpu_time():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def make_images(count):
+    from PIL import Image, ImageDraw
+
+    images = {}
+    for i in range(count):
+        image = Image.new("RGB", IMAGE_SIZE, "white")
+        draw = ImageDraw.Draw(image)
+        for line_no, line in enumerate(SAMPLE_LINES):
+            draw.text((40, 60 + line_no * 80), f"{line} #{i}", fill="black")
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=85)
+        data = buffer.getvalue()
+        images[media_ocr.image_hash(data)] = data
+    return images
+
+
+def bench_media_ocr():
+    if not media_ocr.OCR_AVAILABLE:
+        print("media_ocr: skipped (pillow/pytesseract not installed)")
+        return
+
+    images = make_images(IMAGE_COUNT)
+    cache = {}
+
+    # Cold run: every image goes through the process pool
+    cpu_start, start = cpu_time(), time.perf_counter()
+    pool = media_ocr.create_pool()
+    _, errors = asyncio.run(media_ocr.extract_texts(pool, images, cache))
+    pool.shutdown()  # Workers must exit before their CPU time is visible
+    elapsed, cpu = time.perf_counter() - start, cpu_time() - cpu_start
+
+    if errors:
+        print(f"media_ocr: failed for {len(errors)} images: {errors[0]}")
+        return
+
+    print(f"media_ocr cold | {len(images)} images | {len(images) / elapsed:.1f} images/s | "
+        f"{cpu / len(images) * 1000:.1f} ms CPU/image | {media_ocr.ocr_workers()} workers")
+
+    # Warm run: everything is served from the content-addressed cache
+    start = time.perf_counter()
+    pool = media_ocr.create_pool()
+    asyncio.run(media_ocr.extract_texts(pool, images, cache))
+    pool.shutdown()
+    elapsed = time.perf_counter() - start
+
+    print(f"media_ocr warm | {len(images)} images | {len(images) / elapsed:.1f} images/s | cache hits only")
+
+
+# The matching a deployment per person would do: every profile checked separately
+def match_separately(text, keywords_by_profile):
+    text_lower = text.lower()
+    matches = {}
+    for name, keywords in keywords_by_profile.items():
+        matched = [", ".join(words) for words in keywords if all(word in text_lower for word in words)]
+        if matched:
+            matches[name] = matched
+    return matches
+
+
+def make_profiles(count, rng):
+    keywords_by_profile = {}
+    for i in range(count):
+        keywords = []
+        for _ in range(KEYWORDS_PER_PROFILE):
+            keywords.append(rng.sample(VOCABULARY, rng.choice([1, 1, 2])))
+        keywords_by_profile[f"profile{i}"] = keywords
+    return keywords_by_profile
+
+
+def make_messages(count, rng):
+    messages = []
+    for _ in range(count):
+        words = rng.sample(VOCABULARY, 3) + ["sale", "price", "shipping"] * 10
+        rng.shuffle(words)
+        messages.append(" ".join(words))
+    return messages
+
+
+# Stands in for TelegramClient and counts the requests main.py makes
+class CountingClient:
+    def __init__(self, messages):
+        self.messages = messages
+        self.fetches = 0
+        self.downloads = 0
+
+    async def iter_messages(self, group_id):
+        self.fetches += 1
+        for message in self.messages:
+            yield message
+
+    async def download_media(self, message, file=None, thumb=None):
+        self.downloads += 1
+        return None  # No bytes, so nothing goes on to OCR
+
+
+def make_group_messages(rng, photo_sizes):
+    now = datetime.now(timezone.utc)
+    messages = []
+    for i, text in enumerate(make_messages(GROUP_MESSAGE_COUNT, rng)):
+        photo = SimpleNamespace(sizes=photo_sizes) if i % IMAGE_EVERY == 0 else None
+        messages.append(SimpleNamespace(text=text, date=now, photo=photo, document=None))
+    return messages
+
+
+# Run main.fetch_group_messages over every group and count the Telegram requests
+def run_fetch(main, messages, matcher, profile_list):
+    client = CountingClient(messages)
+    pool = ThreadPoolExecutor(max_workers=1)  # Only enables the media stage, download returns nothing
+
+    async def fetch_all():
+        for group_id in range(GROUP_COUNT):
+            await main.fetch_group_messages(client, group_id, f"Group {group_id}", matcher, profile_list, pool, {})
+
+    start = time.perf_counter()
+    asyncio.run(fetch_all())
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return client, elapsed
+
+
+def bench_profiles():
+    rng = random.Random(0)
+    messages = make_messages(MESSAGE_COUNT, rng)
+
+    try:
+        os.environ.setdefault("TELEGRAM_API_ID", "0")  # main.py reads it on import
+        import main
+        from telethon.tl import types
+        main.log = lambda message: None  # Keep files/script.log clean
+        photo_sizes = [types.PhotoSize(type="m", w=320, h=240, size=20000),
+                       types.PhotoSize(type="x", w=800, h=600, size=90000),
+                       types.PhotoSize(type="y", w=1280, h=960, size=180000)]
+        group_messages = make_group_messages(rng, photo_sizes)
+    except ImportError as e:
+        main = None
+        print(f"profiles: fetch counting skipped ({e})")
+
+    for count in PROFILE_COUNTS:
+        keywords_by_profile = make_profiles(count, rng)
+        matcher = profiles.KeywordMatcher(keywords_by_profile)
+
+        start = time.perf_counter()
+        for text in messages:
+            match_separately(text, keywords_by_profile)
+        separate = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in messages:
+            matcher.match(text)
+        combined = time.perf_counter() - start
+
+        fetch_info = ""
+        if main is not None:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                profile_list = []
+                for name in keywords_by_profile:
+                    profile = profiles.default_profile()._replace(name=name, json_dir=os.path.join(tmp_dir, name))
+                    os.makedirs(profile.json_dir)
+                    profile_list.append(profile)
+                client, elapsed = run_fetch(main, group_messages, matcher, profile_list)
+            fetch_info = (f" | {client.fetches} fetches, {client.downloads} downloads for {GROUP_COUNT} groups"
+                f" | fetch+save {elapsed * 1000:.0f} ms")
+
+        print(f"profiles {count:>3} | {len(matcher.word_rules)} distinct words | "
+            f"separate {separate / len(messages) * 1e6:.1f} us/msg | "
+            f"combined {combined / len(messages) * 1e6:.1f} us/msg{fetch_info}")
+
+
+BENCHMARKS = {
+    "media_ocr": bench_media_ocr,
+    "profiles": bench_profiles,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import asyncio
 from datetime import datetime
 from telethon import TelegramClient
 from dotenv import load_dotenv
+import profiles
 
 load_dotenv()
 
@@ -12,7 +13,6 @@ load_dotenv()
 bot_token = os.getenv("TELEGRAM_BUY_BOT_TOKEN") 
 api_id = int(os.getenv("TELEGRAM_API_ID")) 
 api_hash = os.getenv("TELEGRAM_API_HASH")  
-TELEGRAM_CHAT_ID = int(os.getenv("TELEGRAM_CHAT_ID"))
 
 # File paths
 files_dir = "files"
@@ -20,7 +20,6 @@ json_dir = "telegram_data"
 html_dir = "html"
 log_file = os.path.join(files_dir, "script.log")
 current_date = datetime.now().strftime("%d-%m-%Y")  # Format date as DD-MM-YYYY
-html_file_path = os.path.join(html_dir, f"{current_date}.html")
 
 # Ensure necessary directories exist
 os.makedirs(files_dir, exist_ok=True)
@@ -34,7 +33,10 @@ def log(message):
     with open(log_file, "a", encoding="utf-8") as log_f:
         log_f.write(formatted_message + "\n")
 
-def load_latest_json():
+def profile_html_file(profile):
+    return os.path.join(profile.html_dir, f"{current_date}.html")
+
+def load_latest_json(json_dir=json_dir):
     today_filename = datetime.now().strftime("%d-%m-%Y") + ".json"
     today_json_path = os.path.join(json_dir, today_filename)
 
@@ -54,7 +56,7 @@ def load_latest_json():
     with open(latest_json_path, "r", encoding="utf-8") as file:
         return json.load(file)
 
-def generate_html(posts):
+def generate_html(posts, html_file_path):
     if not posts:
         log("No posts to include in the summary!")
         return
@@ -119,23 +121,18 @@ def generate_html(posts):
 
     log(f"Generated HTML summary: {html_file_path}")
 
-async def send_html_as_file():
+async def send_html_as_file(client, chat_id, html_file_path):
     """Sends the generated HTML summary as a file to Telegram using a bot."""
     if not os.path.exists(html_file_path):
         log("HTML file not found! Exiting.")
         return
 
-    # Initialize the client and start it correctly
-    client = TelegramClient("bot_session", api_id, api_hash)
-
-    await client.start(bot_token=bot_token)  # Ensure the bot is started before sending
-    await client.send_file(TELEGRAM_CHAT_ID, html_file_path, caption="Daily Telegram Summary")
+    await client.send_file(chat_id, html_file_path, caption="Daily Telegram Summary")
 
-    log("HTML summary sent as file successfully!")
-    await client.disconnect()  # Properly disconnect after sending
+    log(f"HTML summary sent as file successfully to {chat_id}!")
 
 
-async def send_summary_as_message(posts):
+async def send_summary_as_message(client, chat_id, posts):
     if not posts:
         log("No posts available to send as a message!")
         return
@@ -163,25 +160,37 @@ async def send_summary_as_message(posts):
     if current_message:
         message_parts.append(current_message)  # Append last chunk
 
-    client = TelegramClient("bot_session", api_id, api_hash)
-    await client.start(bot_token=bot_token)
-
     for msg in message_parts:
-        await client.send_message(TELEGRAM_CHAT_ID, msg, parse_mode="md", link_preview=False)
+        await client.send_message(chat_id, msg, parse_mode="md", link_preview=False)
 
-    log("Summary sent as multiple messages successfully.")
-    await client.disconnect()
+    log(f"Summary sent as multiple messages successfully to {chat_id}.")
 
 
 async def main():
     log("Starting summary generation...")
 
-    posts = load_latest_json()
-    if posts:
-        generate_html(posts)
-
-        await send_html_as_file()    
-        # await send_summary_as_message(posts) 
+    summaries = []  # (profile, posts, html file)
+    for profile in profiles.load_profiles(log):
+        posts = load_latest_json(profile.json_dir)
+        if posts:
+            os.makedirs(profile.html_dir, exist_ok=True)
+            html_file_path = profile_html_file(profile)
+            generate_html(posts, html_file_path)
+            summaries.append((profile, posts, html_file_path))
+
+    if summaries:
+        # One bot session for all profiles
+        client = TelegramClient("bot_session", api_id, api_hash)
+        await client.start(bot_token=bot_token)  # Ensure the bot is started before sending
+
+        for profile, posts, html_file_path in summaries:
+            if profile.chat_id is None:
+                log(f"No chat ID for profile {profile.name}. Not sending.")
+                continue
+            await send_html_as_file(client, profile.chat_id, html_file_path)
+            # await send_summary_as_message(client, profile.chat_id, posts)
+
+        await client.disconnect()  # Properly disconnect after sending
 
     log("Summary generation completed.")
 
@@ -5,6 +5,7 @@ from datetime import datetime
 from openai import OpenAI
 from dotenv import load_dotenv
 import csv
+import profiles
 
 # Load environment variables
 load_dotenv()
@@ -33,27 +34,23 @@ def log(message):
     with open(log_file, "a", encoding="utf-8") as log_f:
         log_f.write(formatted_message + "\n")
 
-def load_latest_json():
-    if not os.path.exists(json_dir):
-        log("No JSON directory found!")
-        return None
-    
-    json_files = sorted(
-        [f for f in os.listdir(json_dir) if f.endswith(".json")],
-        reverse=True
-    )
+def profile_output_csv(profile):
+    return os.path.join(profile.analyzed_dir, f"{current_date}.csv")
+
+# Today's posts of one profile, None when it had no matches today
+def load_today_json(json_dir):
+    today_json_path = os.path.join(json_dir, f"{current_date}.json")
 
-    if not json_files:
-        log("No JSON files found!")
+    if not os.path.exists(today_json_path):
+        log(f"Today's JSON file not found: {today_json_path}")
         return None
 
-    latest_json_path = os.path.join(json_dir, json_files[0])
-    log(f"Loading JSON file: {latest_json_path}")
+    log(f"Loading today's JSON file: {today_json_path}")
 
-    with open(latest_json_path, "r", encoding="utf-8") as file:
+    with open(today_json_path, "r", encoding="utf-8") as file:
         return json.load(file)
 
-def load_full_description():
+def load_full_description(description_file=description_file):
     if not os.path.exists(description_file):
         log("Description file not found!")
         return ""
@@ -68,13 +65,15 @@ def clean_json_response(response_text):
         response_text = response_text[:-3]  # Remove trailing ```
     return response_text.strip()
 
-def extract_relevant_info(posts):
+def extract_relevant_info(posts, description_file=description_file):
 
     extracted_data = []
-    full_description = load_full_description()
+    full_description = load_full_description(description_file)
 
     for post in posts:
         text = post.get("text", "")
+        if post.get("media_text"):
+            text += f"\n\nText from the post's image: {post['media_text']}"
         link = post.get("link", "N/A")
 
         prompt = f"""
@@ -130,7 +129,7 @@ def extract_relevant_info(posts):
 
     return extracted_data
 
-def save_to_csv(data):
+def save_to_csv(data, output_csv=output_csv):
 
     headers = ["Product", "Description", "Price", "Is What I'm Looking For", "Link"]
 
@@ -147,10 +146,12 @@ def save_to_csv(data):
 def main():
     log("Starting analysis script...")
     
-    posts = load_latest_json()
-    if posts:
-        extracted_data = extract_relevant_info(posts)
-        save_to_csv(extracted_data)
+    for profile in profiles.load_profiles(log):
+        posts = load_today_json(profile.json_dir)
+        if posts:
+            os.makedirs(profile.analyzed_dir, exist_ok=True)
+            extracted_data = extract_relevant_info(posts, profile.description_file)
+            save_to_csv(extracted_data, profile_output_csv(profile))
 
     log("Analysis script completed.")
 
@@ -5,6 +5,8 @@ import re
 from datetime import datetime, timezone, timedelta
 from telethon import TelegramClient
 from dotenv import load_dotenv
+import media_ocr
+import profiles
 
 load_dotenv()
 
@@ -14,8 +16,8 @@ files_dir = os.path.join(BASE_DIR, "files")
 json_dir = os.path.join(BASE_DIR, "telegram_data")
 log_file = os.path.join(files_dir, "script.log")
 LAST_ID_FILE = os.path.join(files_dir, "last_post_id.json")
-keywords_file = os.path.join(files_dir, "keywords.txt")
 groups_file = os.path.join(files_dir, "telegram_groups.txt")
+ocr_cache_file = os.path.join(files_dir, "ocr_cache.json")
 
 # Ensure directories exist
 os.makedirs(files_dir, exist_ok=True)
@@ -68,37 +70,6 @@ def generate_post_id():
     LAST_POST_ID += 1
     return LAST_POST_ID
 
-def load_keywords():
-    if not os.path.exists(keywords_file):
-        log("Keyword file not found.")
-        return []
-
-    keywords = []
-    with open(keywords_file, "r", encoding="utf-8") as file:
-        for line in file:
-            words = [word.strip().lower() for word in line.strip().split(",")]
-            keywords.append(words)  # Store single words and groups as lists
-
-    return keywords
-
-
-def find_matching_keywords(text, keyword_list):
-    text_lower = text.lower()
-    matching_keywords = []
-
-    for words in keyword_list:
-        if isinstance(words, list) and len(words) > 1:  # multiple words
-            if all(word in text_lower for word in words):
-                matching_keywords.append(", ".join(words)) 
-        elif isinstance(words, list) and len(words) == 1:  # single keyword
-            word = words[0]
-            if word in text_lower:
-                matching_keywords.append(word)
-
-    return matching_keywords
-
-
-
 #Extract the first URL 
 def extract_first_link(text):
     match = re.search(r"https?://\S+", text)
@@ -113,35 +84,51 @@ def load_existing_posts(json_file):
                 return []
     return []
 
-def save_message_if_relevant(message, group_name, json_file):
-    keywords = load_keywords()
-    if not keywords or not message.text.strip():
-        return False  # ignore when no keywords or empty message
+def profile_json_file(profile):
+    return os.path.join(profile.json_dir, f"{current_utc_time.strftime('%d-%m-%Y')}.json")
+
+# Match once against every profile and save the post to each profile that matched
+def save_message_if_relevant(message, group_name, matcher, profile_list, media_text=""):
+    text = message.text or ""
+    # Caption and text read from the image are matched together
+    match_text = "\n\n".join(part for part in (text, media_text) if part.strip())
+    if not match_text:
+        return False  # ignore empty message
     
-    matching_keywords = find_matching_keywords(message.text, keywords)
+    matches = matcher.match(match_text)
+    if not matches:
+        return False # ignore
+
+    post_id = generate_post_id()
+    link = extract_first_link(text)
 
-    if matching_keywords:  # Only save if keywords are found
+    for profile in profile_list:
+        matching_keywords = matches.get(profile.name)
+        if not matching_keywords:
+            continue
+
+        json_file = profile_json_file(profile)
         posts = load_existing_posts(json_file)
-        link = extract_first_link(message.text)
 
         new_message = {
-            "post_id": generate_post_id(),
+            "post_id": post_id,
             "date": message.date.strftime("%d-%m-%Y %H:%M:%S"),
-            "text": message.text,
+            "text": text,
             "source": "Telegram",
             "group_name": group_name,
             "matched_keywords": matching_keywords,
             "link": link
         }
+        if media_text:
+            new_message["media_text"] = media_text
         posts.append(new_message)
 
         with open(json_file, "w", encoding="utf-8") as file:
             json.dump(posts, file, ensure_ascii=False, indent=4)
 
-        log(f"Saved post from {group_name} (Post ID: {new_message['post_id']}) | Keywords: {', '.join(matching_keywords)} | Link: {link}")
-        return True
+        log(f"Saved post from {group_name} for {profile.name} (Post ID: {post_id}) | Keywords: {', '.join(matching_keywords)} | Link: {link}")
 
-    return False # ignore
+    return True
 
 
 def load_groups():
@@ -164,10 +151,22 @@ def load_groups():
     return groups
 
 
-async def fetch_group_messages(client, group_id, group_name):
-    json_file = os.path.join(json_dir, f"{current_utc_time.strftime('%d-%m-%Y')}.json")
+# Download the thumbnail of an image message, None if there is nothing to read
+async def fetch_media_thumb(client, message, group_name):
+    if not (message.photo or message.document):
+        return None
+    try:
+        return await media_ocr.download_thumb(client, message)
+    except Exception as e:
+        log(f"Failed to download thumbnail in {group_name}: {e}")
+        return None
+
+
+async def fetch_group_messages(client, group_id, group_name, matcher, profile_list, ocr_pool=None, ocr_cache=None):
     post_count = 0
     scanned_count = 0
+    media_messages = []  # (message, image hash)
+    images = {}  # image hash -> thumbnail bytes (None when already in the OCR cache)
 
     try:
         async for message in client.iter_messages(group_id):
@@ -177,15 +176,47 @@ async def fetch_group_messages(client, group_id, group_name):
             if msg_date < time_window:
                 break  # Stop fetching messages once we reach an older one
 
+            if ocr_pool is not None:
+                data = await fetch_media_thumb(client, message, group_name)
+                if data:
+                    image_hash = media_ocr.image_hash(data)
+                    images[image_hash] = None if image_hash in ocr_cache else data
+                    media_messages.append((message, image_hash))
+                    continue  # Matched after OCR, together with its caption
+
             if message.text:
-                if save_message_if_relevant(message, group_name, json_file):
+                if save_message_if_relevant(message, group_name, matcher, profile_list):
                     post_count += 1
 
     except Exception as e:
         log(f"Critical error in {group_name}: {e}")
 
+    # OCR runs in the background while the next groups are fetched
+    media_task = None
+    if media_messages:
+        media_task = asyncio.create_task(
+            save_media_messages(group_name, matcher, profile_list, media_messages, images, ocr_pool, ocr_cache)
+        )
+
     log(f"{group_name} | {post_count} posts saved | {scanned_count} messages scanned")
-    return post_count, scanned_count
+    return post_count, scanned_count, media_task
+
+
+# Read the group's images and save the image posts that match
+async def save_media_messages(group_name, matcher, profile_list, media_messages, images, ocr_pool, ocr_cache):
+    post_count = 0
+    try:
+        texts, errors = await media_ocr.extract_texts(ocr_pool, images, ocr_cache)
+        if errors:
+            log(f"Media OCR failed for {len(errors)} images in {group_name}: {errors[0]}")
+        for message, image_hash in media_messages:
+            if save_message_if_relevant(message, group_name, matcher, profile_list, texts[image_hash]):
+                post_count += 1
+    except Exception as e:
+        log(f"Media OCR error in {group_name}: {e}")
+
+    log(f"{group_name} | {post_count} image posts saved | {len(media_messages)} images read")
+    return post_count
 
 async def main():
     global LAST_POST_ID
@@ -200,18 +231,54 @@ async def main():
         log("No groups found.")
         return
 
-    session_path = os.path.join(BASE_DIR, "session")
-    async with TelegramClient(session_path, api_id, api_hash) as client:
-        await client.start(phone_number)
+    # Messages are fetched once and matched against every profile
+    profile_list = profiles.load_profiles(log)
+    matcher = profiles.KeywordMatcher.from_profiles(profile_list, log)
+    if not matcher:
+        log("No keywords found.")
+        return
+
+    for profile in profile_list:
+        os.makedirs(profile.json_dir, exist_ok=True)
 
-        for group_id, group_name in groups:
-            posts_saved, messages_scanned = await fetch_group_messages(client, group_id, group_name)
+    # Optional media stage: OCR of image thumbnails
+    ocr_pool = None
+    ocr_cache = {}
+    if media_ocr.media_ocr_enabled():
+        if not media_ocr.OCR_AVAILABLE:
+            log("Media OCR enabled but pillow/pytesseract are not installed. Skipping images.")
+        else:
+            try:
+                media_ocr.media_max_bytes()  # Fail here, not once per image
+                ocr_pool = media_ocr.create_pool()
+                ocr_cache = media_ocr.load_cache(ocr_cache_file)
+            except ValueError as e:
+                log(f"Invalid media OCR setting in .env: {e}. Skipping images.")
+
+    session_path = os.path.join(BASE_DIR, "session")
+    media_tasks = []
+    try:
+        async with TelegramClient(session_path, api_id, api_hash) as client:
+            await client.start(phone_number)
+
+            for group_id, group_name in groups:
+                posts_saved, messages_scanned, media_task = await fetch_group_messages(client, group_id, group_name, matcher, profile_list, ocr_pool, ocr_cache)
+                total_posts += posts_saved
+                total_scanned += messages_scanned  
+                if media_task is not None:
+                    media_tasks.append(media_task)
+
+        # Wait for the image posts still being read
+        for posts_saved in await asyncio.gather(*media_tasks):
             total_posts += posts_saved
-            total_scanned += messages_scanned  
+    finally:
+        if ocr_pool is not None:
+            ocr_pool.shutdown()
+            media_ocr.save_cache(ocr_cache, ocr_cache_file)
 
     save_last_post_id()  
 
-    log(f"{len(groups)} groups | {total_posts} posts saved | {total_scanned} messages scanned")
+    log(f"{len(groups)} groups | {len(profile_list)} profiles | {total_posts} posts saved | {total_scanned} messages scanned")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,155 @@
+import os
+import io
+import json
+import time
+import hashlib
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+# Optional OCR dependencies (pip install pillow pytesseract + the tesseract binary)
+try:
+    from PIL import Image
+    import pytesseract
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+MEDIA_MAX_PIXELS = 1600 * 1600  # Skip decompression bombs
+CACHE_MAX_AGE_DAYS = 3  # Same retention as actions.py keeps the JSON data
+
+# image hash -> OCR future, so groups processed at the same time share the work
+_running = {}
+
+
+# Settings are read when used, so values from .env (load_dotenv in main) apply
+def media_ocr_enabled():
+    return os.getenv("MEDIA_OCR_ENABLED", "").lower() in ("1", "true", "yes")
+
+
+def ocr_lang():
+    return os.getenv("MEDIA_OCR_LANG", "heb+eng")
+
+
+# Largest thumbnail we download
+def media_max_bytes():
+    return int(os.getenv("MEDIA_OCR_MAX_BYTES", 200 * 1024))
+
+
+def ocr_workers():
+    return int(os.getenv("MEDIA_OCR_WORKERS", os.cpu_count() or 1))
+
+
+# Size in bytes of a Telegram PhotoSize (None when unknown or not a real image)
+def thumb_size(thumb):
+    name = type(thumb).__name__
+    if name == "PhotoSize":
+        return thumb.size
+    if name == "PhotoSizeProgressive":
+        return max(thumb.sizes)
+    if name == "PhotoCachedSize":
+        return len(thumb.bytes)
+    return None  # PhotoStrippedSize is too blurry to read, PhotoPathSize is an outline
+
+
+# Pick the largest thumbnail of a message's image that fits under max_bytes.
+# Returns the thumb type (e.g. "x") to pass to download_media, or None.
+def select_thumb(message, max_bytes):
+    if message.photo:
+        sizes = [(thumb_size(thumb), thumb.type) for thumb in message.photo.sizes or []]
+        sizes = sorted(size for size in sizes if size[0])
+        sizes = sizes[:-1]  # The largest size of a photo is the original, not a thumbnail
+    elif message.document and (message.document.mime_type or "").startswith("image/"):
+        sizes = [(thumb_size(thumb), thumb.type) for thumb in message.document.thumbs or []]
+    else:
+        return None
+
+    best_type, best_size = None, 0
+    for size, thumb_type in sizes:
+        if size and best_size < size <= max_bytes:
+            best_type, best_size = thumb_type, size
+    return best_type
+
+
+async def download_thumb(client, message, max_bytes=None):
+    if max_bytes is None:
+        max_bytes = media_max_bytes()
+    thumb = select_thumb(message, max_bytes)
+    if thumb is None:
+        return None
+    data = await client.download_media(message, file=bytes, thumb=thumb)
+    if not data or len(data) > max_bytes:
+        return None
+    return data
+
+
+def image_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# OCR cache: image hash -> {"text": ..., "last_used": unix time}
+def load_cache(cache_file):
+    if os.path.exists(cache_file):
+        with open(cache_file, "r", encoding="utf-8") as file:
+            try:
+                cache = json.load(file)
+            except json.JSONDecodeError:
+                return {}
+        return {h: entry for h, entry in cache.items() if isinstance(entry, dict)}
+    return {}
+
+
+# Save the cache without entries that weren't used for CACHE_MAX_AGE_DAYS
+def save_cache(cache, cache_file):
+    cutoff = time.time() - CACHE_MAX_AGE_DAYS * 24 * 60 * 60
+    cache = {h: entry for h, entry in cache.items() if entry.get("last_used", 0) >= cutoff}
+    with open(cache_file, "w", encoding="utf-8") as file:
+        json.dump(cache, file, ensure_ascii=False, indent=4)
+
+
+# Runs inside a worker process
+def ocr_image(data, lang):
+    with Image.open(io.BytesIO(data)) as image:
+        if image.width * image.height > MEDIA_MAX_PIXELS:
+            return ""
+        return pytesseract.image_to_string(image.convert("L"), lang=lang).strip()
+
+
+def create_pool(workers=None):
+    if workers is None:
+        workers = ocr_workers()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+# OCR every image (hash -> bytes) that is not already cached, in parallel.
+# Safe to run for several groups at once: an image is only ever read once.
+# The cache is updated in place. Returns a {hash: text} dict for all images and
+# the list of OCR errors (e.g. missing tesseract binary or language data).
+async def extract_texts(pool, images, cache):
+    loop = asyncio.get_running_loop()
+    lang = ocr_lang()
+    pending = {h: data for h, data in images.items() if h not in cache}
+    errors = []
+
+    async def run(h, data):
+        if h in cache:
+            return  # Read by another group in the meantime
+        if h not in _running:
+            _running[h] = loop.run_in_executor(pool, ocr_image, data, lang)
+        try:
+            cache[h] = {"text": await _running[h]}
+        except Exception as e:
+            errors.append(e)  # Not cached, so a broken tesseract install doesn't poison the cache
+        finally:
+            _running.pop(h, None)
+
+    await asyncio.gather(*(run(h, data) for h, data in pending.items()))
+
+    now = int(time.time())
+    texts = {}
+    for h in images:
+        if h in cache:
+            cache[h]["last_used"] = now
+            texts[h] = cache[h]["text"]
+        else:
+            texts[h] = ""
+    return texts, errors
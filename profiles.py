@@ -0,0 +1,116 @@
+import os
+from collections import namedtuple
+
+# Directories
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+files_dir = os.path.join(BASE_DIR, "files")
+profiles_file = os.path.join(files_dir, "profiles.txt")
+profiles_dir = os.path.join(files_dir, "profiles")
+
+# One person's keywords, description, bot chat and output folders
+Profile = namedtuple("Profile", [
+    "name", "chat_id", "keywords_file", "description_file", "json_dir", "html_dir", "analyzed_dir"
+])
+
+
+def default_profile():
+    # Single-user setup: the original file layout and TELEGRAM_CHAT_ID
+    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+    return Profile(
+        name="default",
+        chat_id=int(chat_id) if chat_id else None,
+        keywords_file=os.path.join(files_dir, "keywords.txt"),
+        description_file=os.path.join(files_dir, "full_description.txt"),
+        json_dir=os.path.join(BASE_DIR, "telegram_data"),
+        html_dir=os.path.join(BASE_DIR, "html"),
+        analyzed_dir=os.path.join(BASE_DIR, "analyzed_tables"),
+    )
+
+
+# Read files/profiles.txt (NAME=CHAT_ID per line).
+# Without it the deployment runs as a single default profile.
+def load_profiles(log=print):
+    if not os.path.exists(profiles_file):
+        return [default_profile()]
+
+    profiles = []
+    with open(profiles_file, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith("#") or "=" not in line:
+                continue
+            name, chat_id = (part.strip() for part in line.split("=", 1))
+            # The name is used as a folder name under files/profiles, telegram_data, html, ...
+            if not name or name in (".", "..") or "/" in name or "\\" in name:
+                log(f"Invalid profile name in line: {line}")
+                continue
+            if any(profile.name == name for profile in profiles):
+                log(f"Duplicate profile name in line: {line}")
+                continue
+            try:
+                chat_id = int(chat_id)
+            except ValueError:
+                log(f"Invalid chat ID for profile {name}: {chat_id}")
+                continue
+            profiles.append(Profile(
+                name=name,
+                chat_id=chat_id,
+                keywords_file=os.path.join(profiles_dir, name, "keywords.txt"),
+                description_file=os.path.join(profiles_dir, name, "full_description.txt"),
+                json_dir=os.path.join(BASE_DIR, "telegram_data", name),
+                html_dir=os.path.join(BASE_DIR, "html", name),
+                analyzed_dir=os.path.join(BASE_DIR, "analyzed_tables", name),
+            ))
+    return profiles
+
+
+def load_keywords(keywords_file, log=print):
+    if not os.path.exists(keywords_file):
+        log(f"Keyword file not found: {keywords_file}")
+        return []
+
+    keywords = []
+    with open(keywords_file, "r", encoding="utf-8") as file:
+        for line in file:
+            words = [word.strip().lower() for word in line.strip().split(",")]
+            words = [word for word in words if word]
+            if words:
+                keywords.append(words)  # Store single words and groups as lists
+
+    return keywords
+
+
+# Matches a message against the keywords of every profile in one pass.
+# Each distinct word is searched once per message no matter how many profiles
+# use it, then only the keyword lines that contain a found word are checked.
+class KeywordMatcher:
+    def __init__(self, keywords_by_profile):
+        self.keywords_by_profile = keywords_by_profile
+        self.word_rules = {}  # word -> [(profile name, keyword line index)]
+        for name, keywords in keywords_by_profile.items():
+            for index, words in enumerate(keywords):
+                for word in set(words):
+                    self.word_rules.setdefault(word, []).append((name, index))
+
+    @classmethod
+    def from_profiles(cls, profiles, log=print):
+        return cls({profile.name: load_keywords(profile.keywords_file, log) for profile in profiles})
+
+    def __bool__(self):
+        return bool(self.word_rules)
+
+    # Returns {profile name: [matched keywords]} for profiles with at least one match
+    def match(self, text):
+        text_lower = text.lower()
+        found = {word for word in self.word_rules if word in text_lower}
+
+        candidates = set()
+        for word in found:
+            candidates.update(self.word_rules[word])
+
+        matches = {}
+        for name, index in sorted(candidates, key=lambda rule: rule[1]):
+            words = self.keywords_by_profile[name][index]
+            if found.issuperset(words):  # multiple words must all appear
+                matches.setdefault(name, []).append(", ".join(words))
+        return matches